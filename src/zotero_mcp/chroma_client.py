@@ -5,50 +5,150 @@ This module provides persistent vector database storage and embedding functions
 for semantic search over Zotero libraries.
 """
 
-import json
+import asyncio
+import base64
+import functools
+import hashlib
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
 
 import chromadb
+import numpy as np
 from chromadb import Documents, EmbeddingFunction, Embeddings
 from chromadb.config import Settings
 
+from zotero_mcp import embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
 class OpenAIEmbeddingFunction(EmbeddingFunction):
     """Custom OpenAI embedding function for ChromaDB."""
-    
+
+    # OpenAI enforces a per-request token limit, and ChromaDB may hand us
+    # arbitrarily large batches. Keep sub-batches comfortably under the limit
+    # and embed them in parallel since the work is network-bound.
+    MAX_BATCH_SIZE = 96
+    MAX_BATCH_TOKENS = 250_000
+    MAX_WORKERS = 8
+    MAX_RETRIES = 5
+
     def __init__(self, model_name: str = "text-embedding-3-small", api_key: Optional[str] = None):
         self.model_name = model_name
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        
+
         try:
             import openai
+            self._openai = openai
             self.client = openai.OpenAI(api_key=self.api_key)
         except ImportError:
             raise ImportError("openai package is required for OpenAI embeddings")
-    
+
+        # tiktoken gives exact token counts; fall back to a rough
+        # chars-per-token estimate if it's unavailable for this model.
+        try:
+            import tiktoken
+            self._encoding = tiktoken.encoding_for_model(self.model_name)
+        except Exception:
+            self._encoding = None
+
     def name(self) -> str:
         """Return the name of this embedding function."""
         return "openai"
-    
+
+    def _count_tokens(self, text: str) -> int:
+        """Count (or estimate) the number of tokens in a text."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        # Rough heuristic: ~4 characters per token for English text
+        return max(1, len(text) // 4)
+
+    def _chunk_input(self, input: Documents) -> List[List[str]]:
+        """Split input into sub-batches within size and token budgets."""
+        chunks = []
+        current = []
+        current_tokens = 0
+
+        for text in input:
+            tokens = self._count_tokens(text)
+            if current and (len(current) >= self.MAX_BATCH_SIZE or
+                            current_tokens + tokens > self.MAX_BATCH_TOKENS):
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+            current.append(text)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    @staticmethod
+    def _to_array(embedding) -> np.ndarray:
+        """Convert an API embedding (base64 or float list) to float32."""
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _embed_chunk(self, chunk: List[str]) -> List[np.ndarray]:
+        """Embed one sub-batch, retrying transient API errors with backoff."""
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                # base64 lets us go straight from the wire bytes to a
+                # float32 array without unboxing per-dimension Python floats
+                response = self.client.embeddings.create(
+                    model=self.model_name,
+                    input=chunk,
+                    encoding_format="base64"
+                )
+                return [self._to_array(data.embedding) for data in response.data]
+            except (self._openai.RateLimitError, self._openai.APIConnectionError) as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"OpenAI embedding request failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+
+    def _embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed texts, chunking and parallelizing as needed."""
+        chunks = self._chunk_input(texts)
+
+        if len(chunks) <= 1:
+            return self._embed_chunk(texts)
+
+        # Dispatch sub-batches concurrently; executor.map preserves input order.
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as executor:
+            results = executor.map(self._embed_chunk, chunks)
+
+        embeddings = []
+        for chunk_embeddings in results:
+            embeddings.extend(chunk_embeddings)
+        return embeddings
+
     def __call__(self, input: Documents) -> Embeddings:
-        """Generate embeddings using OpenAI API."""
-        response = self.client.embeddings.create(
-            model=self.model_name,
-            input=input
-        )
-        return [data.embedding for data in response.data]
+        """Generate embeddings using OpenAI API, reusing cached vectors."""
+        texts = list(input)
+        if not texts:
+            return []
+        return embedding_cache.get_or_compute(self.model_name, texts, self._embed_texts)
 
 
 class GeminiEmbeddingFunction(EmbeddingFunction):
     """Custom Gemini embedding function for ChromaDB using google-genai."""
-    
+
+    # The batch-embed endpoint caps contents per request (~100 for
+    # text-embedding-004), so inputs are chunked before the first dispatch.
+    MAX_BATCH_SIZE = 100
+    MAX_WORKERS = 8
+
     def __init__(self, model_name: str = "models/text-embedding-004", api_key: Optional[str] = None):
         self.model_name = model_name
         self.api_key = api_key or os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
@@ -67,21 +167,99 @@ class GeminiEmbeddingFunction(EmbeddingFunction):
         """Return the name of this embedding function."""
         return "gemini"
     
-    def __call__(self, input: Documents) -> Embeddings:
-        """Generate embeddings using Gemini API."""
-        embeddings = []
-        for text in input:
-            response = self.client.models.embed_content(
-                model=self.model_name,
-                contents=[text],
-                config=self.types.EmbedContentConfig(
-                    task_type="retrieval_document",
-                    title="Zotero library document"
-                )
+    def _embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed a batch of texts in a single API call."""
+        response = self.client.models.embed_content(
+            model=self.model_name,
+            contents=texts,
+            config=self.types.EmbedContentConfig(
+                task_type="retrieval_document"
+            )
+        )
+        return [np.asarray(embedding.values, dtype=np.float32)
+                for embedding in response.embeddings]
+
+    def _embed_single(self, text: str) -> np.ndarray:
+        """Embed one text with single-content request semantics."""
+        response = self.client.models.embed_content(
+            model=self.model_name,
+            contents=text,
+            config=self.types.EmbedContentConfig(
+                task_type="retrieval_document"
             )
-            embeddings.append(response.embeddings[0].values)
+        )
+        return np.asarray(response.embeddings[0].values, dtype=np.float32)
+
+    def _embed_chunk(self, chunk: List[str]) -> List[np.ndarray]:
+        """Embed one sub-batch, falling back to per-text requests."""
+        # If the installed SDK version rejects list inputs it raises an
+        # argument/validation error; only then fall back to single-content
+        # requests. Provider-side failures (auth, quota, limits) propagate.
+        try:
+            return self._embed_batch(chunk)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Batch Gemini embedding failed ({e}), falling back to per-text requests")
+            return [self._embed_single(text) for text in chunk]
+
+    def _embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed texts in batched calls, chunked to the API's batch cap."""
+        chunks = [texts[i:i + self.MAX_BATCH_SIZE]
+                  for i in range(0, len(texts), self.MAX_BATCH_SIZE)]
+
+        if len(chunks) == 1:
+            return self._embed_chunk(chunks[0])
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as executor:
+            results = executor.map(self._embed_chunk, chunks)
+
+        embeddings = []
+        for chunk_embeddings in results:
+            embeddings.extend(chunk_embeddings)
         return embeddings
 
+    def __call__(self, input: Documents) -> Embeddings:
+        """Generate embeddings using Gemini API, reusing cached vectors."""
+        texts = list(input)
+        if not texts:
+            return []
+        return embedding_cache.get_or_compute(self.model_name, texts, self._embed_texts)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_embedding_function() -> EmbeddingFunction:
+    """
+    Process-wide default embedding function.
+
+    Constructing DefaultEmbeddingFunction loads the ~90MB all-MiniLM-L6-v2
+    ONNX model and warms an ORT session, so every ChromaClient shares one
+    instance instead of paying that per construction.
+    """
+    return chromadb.utils.embedding_functions.DefaultEmbeddingFunction()
+
+
+# Provider embedding functions keyed by (provider, model, api-key hash) so
+# clients with the same config share one instance - and with it the
+# provider SDK's HTTP connection pool and tokenizer.
+_provider_ef_cache: Dict[tuple, EmbeddingFunction] = {}
+_provider_ef_lock = threading.Lock()
+
+
+def _shared_provider_embedding_function(provider: str,
+                                        model_name: str,
+                                        api_key: Optional[str]) -> EmbeddingFunction:
+    """Get (lazily creating) a shared provider embedding function."""
+    key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()
+    cache_key = (provider, model_name, key_hash)
+    with _provider_ef_lock:
+        ef = _provider_ef_cache.get(cache_key)
+        if ef is None:
+            if provider == "openai":
+                ef = OpenAIEmbeddingFunction(model_name=model_name, api_key=api_key)
+            else:
+                ef = GeminiEmbeddingFunction(model_name=model_name, api_key=api_key)
+            _provider_ef_cache[cache_key] = ef
+        return ef
+
 
 class ChromaClient:
     """ChromaDB client for Zotero semantic search."""
@@ -103,6 +281,15 @@ class ChromaClient:
         self.collection_name = collection_name
         self.embedding_model = embedding_model
         self.embedding_config = embedding_config or {}
+
+        # Bounds concurrent async embed/write batches so a fast producer
+        # can't queue unbounded embedding work in memory.
+        self.max_inflight = 4
+        self._async_semaphore = asyncio.Semaphore(self.max_inflight)
+
+        # Chroma slows down badly when add/upsert receives one huge list,
+        # so writes are split into fixed-size chunks.
+        self.upsert_chunk_size = int(self.embedding_config.get("upsert_chunk_size", 5000))
         
         # Set up persistent directory
         if persist_directory is None:
@@ -153,16 +340,16 @@ class ChromaClient:
         if self.embedding_model == "openai":
             model_name = self.embedding_config.get("model_name", "text-embedding-3-small")
             api_key = self.embedding_config.get("api_key")
-            return OpenAIEmbeddingFunction(model_name=model_name, api_key=api_key)
-        
+            return _shared_provider_embedding_function("openai", model_name, api_key)
+
         elif self.embedding_model == "gemini":
             model_name = self.embedding_config.get("model_name", "models/text-embedding-004")
             api_key = self.embedding_config.get("api_key")
-            return GeminiEmbeddingFunction(model_name=model_name, api_key=api_key)
-        
+            return _shared_provider_embedding_function("gemini", model_name, api_key)
+
         else:
             # Use ChromaDB's default embedding function (all-MiniLM-L6-v2)
-            return chromadb.utils.embedding_functions.DefaultEmbeddingFunction()
+            return _default_embedding_function()
     
     def add_documents(self, 
                      documents: List[str], 
@@ -177,12 +364,14 @@ class ChromaClient:
             ids: List of unique IDs for each document
         """
         try:
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to ChromaDB collection")
+            for start in range(0, len(documents), self.upsert_chunk_size):
+                end = start + self.upsert_chunk_size
+                self.collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+                logger.info(f"Added {min(end, len(documents))}/{len(documents)} documents to ChromaDB collection")
         except Exception as e:
             logger.error(f"Error adding documents to ChromaDB: {e}")
             raise
@@ -200,18 +389,46 @@ class ChromaClient:
             ids: List of unique IDs for each document
         """
         try:
-            self.collection.upsert(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Upserted {len(documents)} documents to ChromaDB collection")
+            for start in range(0, len(documents), self.upsert_chunk_size):
+                end = start + self.upsert_chunk_size
+                self.collection.upsert(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+                logger.info(f"Upserted {min(end, len(documents))}/{len(documents)} documents to ChromaDB collection")
         except Exception as e:
             logger.error(f"Error upserting documents to ChromaDB: {e}")
             raise
     
-    def search(self, 
-               query_texts: List[str], 
+    async def aadd_documents(self,
+                             documents: List[str],
+                             metadatas: List[Dict[str, Any]],
+                             ids: List[str]) -> None:
+        """
+        Async wrapper around add_documents.
+
+        Runs the embedding and ChromaDB write in a worker thread so the
+        MCP server's event loop stays responsive during index builds.
+        """
+        async with self._async_semaphore:
+            await asyncio.to_thread(self.add_documents, documents, metadatas, ids)
+
+    async def aupsert_documents(self,
+                                documents: List[str],
+                                metadatas: List[Dict[str, Any]],
+                                ids: List[str]) -> None:
+        """
+        Async wrapper around upsert_documents.
+
+        Runs the embedding and ChromaDB write in a worker thread so the
+        MCP server's event loop stays responsive during index builds.
+        """
+        async with self._async_semaphore:
+            await asyncio.to_thread(self.upsert_documents, documents, metadatas, ids)
+
+    def search(self,
+               query_texts: List[str],
                n_results: int = 10,
                where: Optional[Dict[str, Any]] = None,
                where_document: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -296,6 +513,16 @@ class ChromaClient:
             return False
 
 
+# Per-provider environment lookup: (api key env vars, model env var,
+# default model name)
+_PROVIDER_ENV = {
+    "openai": (("OPENAI_API_KEY",),
+               "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+    "gemini": (("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+               "GEMINI_EMBEDDING_MODEL", "models/text-embedding-004"),
+}
+
+
 def create_chroma_client(config_path: Optional[str] = None) -> ChromaClient:
     """
     Create a ChromaClient instance from configuration.
@@ -312,40 +539,30 @@ def create_chroma_client(config_path: Optional[str] = None) -> ChromaClient:
         "embedding_model": "default",
         "embedding_config": {}
     }
-    
-    # Load configuration from file if it exists
-    if config_path and os.path.exists(config_path):
-        try:
-            with open(config_path, 'r') as f:
-                file_config = json.load(f)
-                config.update(file_config.get("semantic_search", {}))
-        except Exception as e:
-            logger.warning(f"Error loading config from {config_path}: {e}")
-    
-    # Load configuration from environment variables
+
     env_embedding_model = os.getenv("ZOTERO_EMBEDDING_MODEL")
+
+    # Load configuration from file. The cached loader skips re-parsing an
+    # unchanged file; with no config_path the env-only path does no I/O.
+    if config_path:
+        from zotero_mcp.write_bridge.config import load_config
+        config.update(load_config(Path(config_path)).get("semantic_search", {}))
+
+    # Environment overrides the file
     if env_embedding_model:
         config["embedding_model"] = env_embedding_model
-    
+
     # Set up embedding config from environment
-    if config["embedding_model"] == "openai":
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        openai_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-        if openai_api_key:
+    env_spec = _PROVIDER_ENV.get(config["embedding_model"])
+    if env_spec:
+        key_envs, model_env, default_model = env_spec
+        api_key = next(filter(None, (os.getenv(e) for e in key_envs)), None)
+        if api_key:
             config["embedding_config"] = {
-                "api_key": openai_api_key,
-                "model_name": openai_model
+                "api_key": api_key,
+                "model_name": os.getenv(model_env, default_model)
             }
-    
-    elif config["embedding_model"] == "gemini":
-        gemini_api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        gemini_model = os.getenv("GEMINI_EMBEDDING_MODEL", "models/text-embedding-004")
-        if gemini_api_key:
-            config["embedding_config"] = {
-                "api_key": gemini_api_key,
-                "model_name": gemini_model
-            }
-    
+
     return ChromaClient(
         collection_name=config["collection_name"],
         embedding_model=config["embedding_model"],
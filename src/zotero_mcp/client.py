@@ -2,6 +2,7 @@
 Zotero client wrapper for MCP server.
 """
 
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -27,6 +28,17 @@ class AttachmentDetails:
     content_type: str
 
 
+@functools.lru_cache(maxsize=1)
+def is_local_mode() -> bool:
+    """
+    Whether ZOTERO_LOCAL enables the local Zotero API.
+
+    The environment is treated as frozen after process start, so the
+    parse happens once; tests can reset via is_local_mode.cache_clear().
+    """
+    return os.getenv("ZOTERO_LOCAL", "").lower() in {"true", "yes", "1"}
+
+
 def get_zotero_client() -> zotero.Zotero:
     """
     Get authenticated Zotero client using environment variables.
@@ -40,7 +52,7 @@ def get_zotero_client() -> zotero.Zotero:
     library_id = os.getenv("ZOTERO_LIBRARY_ID")
     library_type = os.getenv("ZOTERO_LIBRARY_TYPE", "user")
     api_key = os.getenv("ZOTERO_API_KEY")
-    local = os.getenv("ZOTERO_LOCAL", "").lower() in ["true", "yes", "1"]
+    local = is_local_mode()
 
     # For local API, default to user ID 0 if not specified
     if local and not library_id:
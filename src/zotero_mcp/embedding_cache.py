@@ -0,0 +1,215 @@
+"""
+Persistent embedding cache for semantic search.
+
+This module provides a content-addressed SQLite cache keyed by
+(model, sha256(text)) so that re-indexing a mostly unchanged Zotero
+library skips the embedding API entirely for documents already seen.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".config" / "zotero-mcp" / "emb_cache.sqlite"
+
+
+class _LRUCache:
+    """Small bounded LRU mapping used as the in-process hot tier."""
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        """Return the cached value (refreshing recency), or None."""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value) -> None:
+        """Insert a value, evicting the least recently used on overflow."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class EmbeddingCache:
+    """
+    Two-tier content-addressed cache for embedding vectors.
+
+    A bounded in-process LRU (L1) serves hot lookups without touching
+    disk and keeps RSS flat in long-running server sessions; the SQLite
+    file (L2) persists everything across processes. L1 holds the encoded
+    (typically int8-quantized) blobs, so at the default size it costs a
+    few MB at most.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, quantize: bool = True):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            cache_path: Path to the SQLite cache file. Defaults to
+                ~/.config/zotero-mcp/emb_cache.sqlite
+            quantize: Store vectors as int8 with a per-vector scale
+                (4x smaller on disk). Set False for lossless float32.
+        """
+        path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path = str(path)
+        self.quantize = quantize
+
+        # Embedding functions may run inside a thread pool, so share one
+        # connection guarded by a lock.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb (hash BLOB PRIMARY KEY, model TEXT, vec BLOB)"
+        )
+        # Older caches predate the storage-format column; NULL means float32.
+        try:
+            self._conn.execute("ALTER TABLE emb ADD COLUMN fmt TEXT")
+        except sqlite3.OperationalError:
+            pass
+        self._conn.commit()
+
+        self._l1 = _LRUCache()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    @staticmethod
+    def _key(model_name: str, text: str) -> bytes:
+        """Content-addressed cache key for a (model, text) pair."""
+        return hashlib.sha256((model_name + "\0" + text).encode()).digest()
+
+    def _get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a single vector in L1 then L2, or None on a miss."""
+        entry = self._l1.get(key)
+        if entry is not None:
+            self._stats["l1_hits"] += 1
+            return self._decode(*entry)
+
+        row = self._conn.execute(
+            "SELECT vec, fmt FROM emb WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._stats["l2_hits"] += 1
+        self._l1.put(key, (row[0], row[1]))
+        return self._decode(row[0], row[1])
+
+    def _encode(self, vec) -> tuple:
+        """Serialize a vector for storage, returning (blob, format)."""
+        arr = np.asarray(vec, dtype=np.float32)
+        if self.quantize:
+            scale = float(np.max(np.abs(arr))) / 127.0 if arr.size else 0.0
+            if scale > 0.0:
+                qv = np.clip(np.round(arr / scale), -127, 127).astype(np.int8)
+                return struct.pack("<f", scale) + qv.tobytes(), "i8"
+        return arr.tobytes(), "f32"
+
+    def _decode(self, blob: bytes, fmt: Optional[str]) -> np.ndarray:
+        """Deserialize a stored vector; fmt is None or 'f32' for float32."""
+        if fmt == "i8":
+            scale = struct.unpack("<f", blob[:4])[0]
+            qv = np.frombuffer(blob, dtype=np.int8, offset=4)
+            return qv.astype(np.float32) * scale
+        return np.frombuffer(blob, dtype=np.float32)
+
+    def get_or_compute(self,
+                       model_name: str,
+                       texts: List[str],
+                       compute_fn: Callable[[List[str]], List]) -> List:
+        """
+        Return embeddings for texts, computing only the cache misses.
+
+        Args:
+            model_name: Name of the embedding model (part of the cache key)
+            texts: Texts to embed
+            compute_fn: Called with the list of uncached texts; must return
+                one vector per text in the same order
+
+        Returns:
+            One embedding per input text, in input order. Cached vectors
+            come back as float32 numpy arrays; freshly computed vectors are
+            passed through as compute_fn returned them.
+        """
+        if not texts:
+            return []
+
+        keys = [self._key(model_name, text) for text in texts]
+        results: List = [None] * len(texts)
+        miss_indices = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._get(key)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    miss_indices.append(i)
+
+        if miss_indices:
+            new_vectors = compute_fn([texts[i] for i in miss_indices])
+            with self._lock:
+                self._stats["misses"] += len(miss_indices)
+                for i, vec in zip(miss_indices, new_vectors):
+                    results[i] = vec
+                    blob, fmt = self._encode(vec)
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO emb (hash, model, vec, fmt) VALUES (?, ?, ?, ?)",
+                        (keys[i], model_name, blob, fmt)
+                    )
+                    self._l1.put(keys[i], (blob, fmt))
+                self._conn.commit()
+
+        logger.info(f"reused {len(texts) - len(miss_indices)} cached, "
+                    f"embedded {len(miss_indices)} new")
+        return results
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters: {'l1_hits': ..., 'l2_hits': ..., 'misses': ...}."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> EmbeddingCache:
+    """Get (lazily creating) the process-wide default embedding cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            quantize = os.getenv("ZOTERO_EMBEDDING_CACHE_QUANTIZE", "true").lower() in ["true", "yes", "1"]
+            _default_cache = EmbeddingCache(quantize=quantize)
+        return _default_cache
+
+
+def get_or_compute(model_name: str,
+                   texts: List[str],
+                   compute_fn: Callable[[List[str]], List]) -> List:
+    """Convenience wrapper around the default cache's get_or_compute."""
+    return get_default_cache().get_or_compute(model_name, texts, compute_fn)
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the default cache."""
+    return get_default_cache().cache_stats()
@@ -0,0 +1,382 @@
+"""
+Direct read-only access to a local Zotero SQLite database.
+
+This module reads item metadata, notes, and cached full text straight from
+zotero.sqlite, bypassing the HTTP API entirely. It is only usable when
+running on the same machine as Zotero (ZOTERO_LOCAL=true).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Maximum characters of attachment full text carried per item
+MAX_FULLTEXT_CHARS = 5000
+
+# itemTypeID 14 is 'attachment' in the Zotero schema
+ATTACHMENT_ITEM_TYPE_ID = 14
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Query fragments are module-level constants so every call assembles
+# byte-identical SQL; sqlite3's per-connection statement cache then reuses
+# the compiled statement instead of re-running the query planner.
+#
+# The type (and optional key) filter happens in a CTE so the LEFT JOINs
+# are driven from the already-reduced item set, and a keyed lookup
+# reduces to a single index probe before any join runs. Notes and
+# attachment keys are pre-aggregated in derived tables: joining both
+# row-level would cross-multiply them (each note repeated once per
+# attachment and vice versa) before any GROUP BY could collapse the rows.
+_ITEMS_QUERY_CTE = """
+    WITH base AS (
+        SELECT itemID, key, itemTypeID, dateAdded, dateModified
+        FROM items
+        WHERE itemTypeID != ?
+"""
+
+_ITEMS_QUERY_KEY_FILTER = " AND key = ?"
+
+_ITEMS_QUERY_SELECT = """
+    )
+    SELECT
+        i.itemID,
+        i.key,
+        it.typeName,
+        i.dateAdded,
+        i.dateModified,
+        title_val.value AS title,
+        abstract_val.value AS abstract,
+        extra_val.value AS extra,
+        n.notes AS notes,
+        att.attachment_keys AS attachment_keys
+    FROM base i
+    JOIN itemTypes it ON it.itemTypeID = i.itemTypeID
+    LEFT JOIN itemData title_data
+        ON title_data.itemID = i.itemID
+        AND title_data.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'title')
+    LEFT JOIN itemDataValues title_val ON title_val.valueID = title_data.valueID
+    LEFT JOIN itemData abstract_data
+        ON abstract_data.itemID = i.itemID
+        AND abstract_data.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'abstractNote')
+    LEFT JOIN itemDataValues abstract_val ON abstract_val.valueID = abstract_data.valueID
+    LEFT JOIN itemData extra_data
+        ON extra_data.itemID = i.itemID
+        AND extra_data.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'extra')
+    LEFT JOIN itemDataValues extra_val ON extra_val.valueID = extra_data.valueID
+    LEFT JOIN (
+        SELECT parentItemID, group_concat(note, ' ') AS notes
+        FROM itemNotes
+        GROUP BY parentItemID
+    ) n ON n.parentItemID = i.itemID
+    LEFT JOIN (
+        SELECT ia.parentItemID, group_concat(child.key) AS attachment_keys
+        FROM itemAttachments ia
+        JOIN items child ON child.itemID = ia.itemID
+        GROUP BY ia.parentItemID
+    ) att ON att.parentItemID = i.itemID
+    LEFT JOIN deletedItems del ON del.itemID = i.itemID
+    WHERE del.itemID IS NULL
+"""
+
+_ITEMS_QUERY_TEXT_FILTER = """
+    AND lower(coalesce(title_val.value, '') || ' '
+        || coalesce(abstract_val.value, '') || ' '
+        || coalesce(extra_val.value, '') || ' '
+        || coalesce(n.notes, '')) LIKE ? ESCAPE '\\'
+"""
+
+_ITEMS_QUERY_LIMIT = " LIMIT ?"
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE metacharacters so the pattern matches them literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass(slots=True)
+class ZoteroItem:
+    """A Zotero item read from the local database."""
+
+    item_id: int
+    key: str
+    item_type: str
+    title: str
+    abstract: str
+    extra: str
+    notes: str
+    fulltext: str
+    date_added: str
+    date_modified: str
+
+    def get_searchable_text(self) -> str:
+        """Combine the item's text fields into one searchable string."""
+        # Only slice (and mark the truncation) when the full text actually
+        # exceeds the budget; short texts pass through without copying.
+        fulltext = self.fulltext
+        if len(fulltext) > MAX_FULLTEXT_CHARS:
+            fulltext = f"{fulltext[:MAX_FULLTEXT_CHARS]}..."
+        labeled = (
+            ("Title: ", self.title),
+            ("Abstract: ", self.abstract),
+            ("Extra: ", self.extra),
+            ("Notes: ", self.notes),
+            ("Full text: ", fulltext),
+        )
+        return "\n\n".join(f"{label}{value}" for label, value in labeled if value)
+
+
+class LocalZoteroReader:
+    """Read-only reader for a local zotero.sqlite database."""
+
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            data_dir: Zotero data directory containing zotero.sqlite and
+                storage/. Defaults to ZOTERO_DATA_DIR or ~/Zotero.
+        """
+        if data_dir is None:
+            data_dir = os.getenv("ZOTERO_DATA_DIR") or str(Path.home() / "Zotero")
+
+        self.data_dir = Path(data_dir)
+        self.db_path = self.data_dir / "zotero.sqlite"
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Zotero database not found at {self.db_path}")
+
+        # One connection per thread: sqlite3 connections are not safe to
+        # share across threads, and a single shared connection would
+        # serialize every caller once indexing runs in a worker pool.
+        self._tls = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get (lazily opening) this thread's read-only connection."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            # mode=ro only; a live Zotero writes this file continuously,
+            # so the connection must keep honoring SQLite's locking
+            # (immutable=1 would permit stale or torn reads).
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA query_only=1")
+            # Keep sorts/temp B-trees off disk and give SQLite enough mmap
+            # window and page cache to cover a multi-hundred-MB library DB.
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=1073741824")
+            conn.execute("PRAGMA cache_size=-262144")
+            conn.row_factory = sqlite3.Row
+            self._tls.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close all database connections opened by this reader."""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._tls = threading.local()
+
+    def _read_fulltext(self, attachment_keys: Optional[str]) -> str:
+        """
+        Read cached full text for an item's attachments.
+
+        Zotero keeps extracted attachment text in
+        storage/<key>/.zotero-ft-cache; return the first cache found.
+
+        Args:
+            attachment_keys: Comma-separated attachment keys, or None.
+
+        Returns:
+            Cached full text, or an empty string.
+        """
+        if not attachment_keys:
+            return ""
+        for key in attachment_keys.split(","):
+            cache_file = self.data_dir / "storage" / key / ".zotero-ft-cache"
+            if cache_file.exists():
+                try:
+                    return cache_file.read_text(encoding="utf-8", errors="replace")
+                except OSError as e:
+                    logger.warning(f"Could not read fulltext cache for {key}: {e}")
+        return ""
+
+    def _row_to_item(self, row: sqlite3.Row) -> ZoteroItem:
+        """Convert a result row into a ZoteroItem."""
+        notes = row["notes"] or ""
+        if notes:
+            notes = _HTML_TAG_RE.sub("", notes)
+
+        return ZoteroItem(
+            item_id=row["itemID"],
+            key=row["key"],
+            item_type=row["typeName"],
+            title=row["title"] or "",
+            abstract=row["abstract"] or "",
+            extra=row["extra"] or "",
+            notes=notes,
+            fulltext=self._read_fulltext(row["attachment_keys"]),
+            date_added=row["dateAdded"],
+            date_modified=row["dateModified"],
+        )
+
+    def _iter_items_with_text(self,
+                              limit: Optional[int] = None,
+                              where_key: Optional[str] = None,
+                              where_text: Optional[str] = None) -> Iterator[ZoteroItem]:
+        """
+        Iterate library items with their searchable text fields.
+
+        Items are yielded per cursor row, so large libraries stream
+        through without being materialized in memory and downstream work
+        can start on the first row.
+
+        Args:
+            limit: Maximum number of items to yield.
+            where_key: Restrict the query to a single item key. The
+                predicate stays SARGable so SQLite uses the unique index
+                on items.key for a single-row lookup.
+            where_text: Only yield items whose title, abstract, extra, or
+                notes contain this substring (case-insensitive, with LIKE
+                metacharacters matched literally). Evaluated in SQLite so
+                non-matching rows never reach Python.
+
+        Yields:
+            ZoteroItem objects.
+        """
+        query = _ITEMS_QUERY_CTE
+        params: list = [ATTACHMENT_ITEM_TYPE_ID]
+
+        if where_key is not None:
+            query += _ITEMS_QUERY_KEY_FILTER
+            params.append(where_key)
+
+        query += _ITEMS_QUERY_SELECT
+
+        if where_text is not None:
+            query += _ITEMS_QUERY_TEXT_FILTER
+            params.append(f"%{_escape_like(where_text.lower())}%")
+
+        if limit is not None:
+            query += _ITEMS_QUERY_LIMIT
+            params.append(limit)
+
+        conn = self._get_connection()
+        cursor = conn.execute(query, params)
+        for row in cursor:
+            yield self._row_to_item(row)
+
+    def get_items_with_text(self,
+                            limit: Optional[int] = None,
+                            where_key: Optional[str] = None) -> List[ZoteroItem]:
+        """
+        Get library items with their searchable text fields.
+
+        Thin list wrapper around _iter_items_with_text for callers that
+        need the whole library at once.
+
+        Args:
+            limit: Maximum number of items to return.
+            where_key: Restrict the query to a single item key.
+
+        Returns:
+            List of ZoteroItem objects.
+        """
+        return list(self._iter_items_with_text(limit=limit, where_key=where_key))
+
+    def get_item_by_key(self, key: str) -> Optional[ZoteroItem]:
+        """
+        Get a single item by its Zotero key.
+
+        Args:
+            key: The Zotero item key.
+
+        Returns:
+            The matching ZoteroItem, or None if not found.
+        """
+        items = self.get_items_with_text(where_key=key)
+        return items[0] if items else None
+
+    def search_items_by_text(self, query: str, limit: int = 10) -> List[ZoteroItem]:
+        """
+        Search items whose text contains a substring (case-insensitive).
+
+        Title, abstract, extra, and note matches are filtered inside
+        SQLite, so non-matching rows never cross into Python. Attachment
+        full text lives in cache files rather than the database, so it is
+        only scanned if the SQL pass comes up short of the limit.
+        Non-ASCII queries are matched entirely in Python, since SQLite's
+        lower()/LIKE only case-fold ASCII.
+
+        Args:
+            query: Substring to search for.
+            limit: Maximum number of results.
+
+        Returns:
+            List of matching ZoteroItem objects.
+        """
+        query_lower = query.lower()
+
+        if not query.isascii():
+            results = []
+            for item in self._iter_items_with_text():
+                if query_lower in item.get_searchable_text().lower():
+                    results.append(item)
+                    if len(results) >= limit:
+                        break
+            return results
+
+        results = list(self._iter_items_with_text(limit=limit, where_text=query))
+        if len(results) >= limit:
+            return results
+
+        # Fall back to scanning cached full text for items the SQL filter
+        # couldn't see, stopping as soon as the limit is hit.
+        matched_keys = {item.key for item in results}
+        for item in self._iter_items_with_text():
+            if item.key in matched_keys:
+                continue
+            if query_lower in item.fulltext.lower():
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def get_local_zotero_reader(data_dir: Optional[str] = None) -> LocalZoteroReader:
+    """
+    Create a LocalZoteroReader, checking that local mode is enabled.
+
+    Args:
+        data_dir: Optional Zotero data directory override.
+
+    Returns:
+        A configured LocalZoteroReader instance.
+
+    Raises:
+        ValueError: If ZOTERO_LOCAL is not enabled.
+    """
+    from zotero_mcp.client import is_local_mode
+
+    if not is_local_mode():
+        raise ValueError(
+            "Local database access requires ZOTERO_LOCAL=true in the environment."
+        )
+    return LocalZoteroReader(data_dir=data_dir)
@@ -44,7 +44,9 @@ async def server_lifespan(server: FastMCP):
                 # Run update in background to avoid blocking server startup
                 async def background_update():
                     try:
-                        stats = search.update_database()
+                        # update_database is synchronous (embedding + DB
+                        # writes), so keep it off the event loop
+                        stats = await asyncio.to_thread(search.update_database)
                         print(f"Database update completed: {stats.get('processed_items', 0)} items processed")
                     except Exception as e:
                         print(f"Background database update failed: {e}")
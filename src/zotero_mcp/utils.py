@@ -10,10 +10,11 @@ def format_creators(creators: List[Dict[str, str]]) -> str:
     Returns:
         Formatted string with creator names.
     """
-    names = []
-    for creator in creators:
-        if "firstName" in creator and "lastName" in creator:
-            names.append(f"{creator['lastName']}, {creator['firstName']}")
-        elif "name" in creator:
-            names.append(creator["name"])
+    names = [
+        f"{creator['lastName']}, {creator['firstName']}"
+        if "firstName" in creator and "lastName" in creator
+        else creator["name"]
+        for creator in creators
+        if ("firstName" in creator and "lastName" in creator) or "name" in creator
+    ]
     return "; ".join(names) if names else "No authors listed"
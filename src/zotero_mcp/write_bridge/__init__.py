@@ -0,0 +1,12 @@
+"""
+Client for the local Zotero write bridge.
+
+The write bridge is a small loopback HTTP service (provided by the
+zotero-mcp Zotero plugin) that performs library writes - tagging and
+notes - which the read-only local APIs cannot.
+"""
+
+from zotero_mcp.write_bridge.client import WriteBridgeClient
+from zotero_mcp.write_bridge.config import get_bridge_token
+
+__all__ = ["WriteBridgeClient", "get_bridge_token"]
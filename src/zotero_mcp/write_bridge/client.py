@@ -0,0 +1,208 @@
+"""
+HTTP client for the local Zotero write bridge.
+
+All traffic goes to a loopback HTTP endpoint, so requests are cheap but
+frequent; the client keeps one persistent keep-alive session with a
+small connection pool and retries transient bridge errors.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from zotero_mcp.write_bridge.config import get_bridge_token, set_bridge_token
+
+DEFAULT_BRIDGE_URL = "http://127.0.0.1:23120"
+
+
+class WriteBridgeClient:
+    """Client to interact with the local Zotero write bridge."""
+
+    def __init__(self,
+                 base_url: str = DEFAULT_BRIDGE_URL,
+                 token: Optional[str] = None,
+                 timeout: int = 30):
+        """
+        Initialize the bridge client.
+
+        Args:
+            base_url: Base URL of the write bridge.
+            token: Auth token; defaults to the stored config token.
+            timeout: Per-request timeout in seconds.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.token = token or get_bridge_token()
+        self.timeout = timeout
+
+        # One pooled keep-alive session instead of a fresh TCP connection
+        # per call; bulk write operations are dominated by connection
+        # setup otherwise. 502/503/504 from the bridge are retried with
+        # backoff since they are transient while Zotero is busy.
+        self._session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+        )
+        self._session.mount("http://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=8,
+            max_retries=retry,
+        ))
+        self._session.headers.update({
+            "Connection": "keep-alive",
+            "User-Agent": "python/zotero-mcp",
+        })
+        if self.token:
+            self._session.headers["Authorization"] = f"Bearer {self.token}"
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def __enter__(self) -> "WriteBridgeClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def _decode_response(resp: requests.Response) -> Dict[str, Any]:
+        """Decode a bridge response as JSON, falling back to raw text."""
+        try:
+            return resp.json()
+        except ValueError:
+            return {"raw": resp.text}
+
+    def _get(self, path: str, timeout: Optional[int] = None) -> Dict[str, Any]:
+        """GET a bridge route and decode the response."""
+        resp = self._session.get(f"{self.base_url}{path}",
+                                 timeout=timeout or self.timeout)
+        resp.raise_for_status()
+        return self._decode_response(resp)
+
+    def _post(self, path: str, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """POST to a bridge route and decode the response."""
+        resp = self._session.post(f"{self.base_url}{path}", json=json_body,
+                                  timeout=self.timeout)
+        resp.raise_for_status()
+        return self._decode_response(resp)
+
+    def health(self) -> Dict[str, Any]:
+        """Check that the bridge is up and reachable."""
+        return self._get("/health", timeout=5)
+
+    def init_token(self) -> Dict[str, Any]:
+        """
+        Request a new auth token from the bridge and persist it.
+
+        Returns:
+            The bridge response, including the new token.
+        """
+        result = self._post("/init_token")
+
+        token = result.get("token")
+        if token:
+            self.token = token
+            self._session.headers["Authorization"] = f"Bearer {token}"
+            set_bridge_token(token)
+        return result
+
+    def tag(self,
+            item_key: str,
+            add: Optional[List[str]] = None,
+            remove: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Add and/or remove tags on an item.
+
+        Args:
+            item_key: Zotero item key.
+            add: Tags to add.
+            remove: Tags to remove.
+
+        Returns:
+            The bridge response.
+        """
+        return self._post("/tag", {
+            "itemKey": item_key,
+            "add": add or [],
+            "remove": remove or [],
+        })
+
+    def tag_batch(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply many tag operations in a single request.
+
+        Args:
+            ops: Operations of the form
+                {"itemKey": ..., "add": [...], "remove": [...]}.
+
+        Returns:
+            The bridge response.
+        """
+        return self._post("/tag_batch", {"ops": ops})
+
+    def note_batch(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Attach many notes in a single request.
+
+        Args:
+            ops: Operations of the form
+                {"parentItemKey": ..., "note": ...}.
+
+        Returns:
+            The bridge response.
+        """
+        return self._post("/note_batch", {"ops": ops})
+
+    async def tag_many(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Tag many items, using the batch route when the bridge supports it.
+
+        Falls back to bounded-concurrency per-item requests when the
+        bridge predates the /tag_batch route, so callers get the speedup
+        either way.
+
+        Args:
+            ops: Operations of the form
+                {"itemKey": ..., "add": [...], "remove": [...]}.
+
+        Returns:
+            The bridge response, or {"results": [...]} from the fallback.
+        """
+        try:
+            return await asyncio.to_thread(self.tag_batch, ops)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+
+        semaphore = asyncio.Semaphore(8)
+
+        async def _tag_one(op: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.tag, op["itemKey"], op.get("add"), op.get("remove")
+                )
+
+        results = await asyncio.gather(*(_tag_one(op) for op in ops))
+        return {"results": list(results)}
+
+    def note(self, parent_item_key: str, note: str) -> Dict[str, Any]:
+        """
+        Attach a note to an item.
+
+        Args:
+            parent_item_key: Key of the item to attach the note to.
+            note: Note content (HTML).
+
+        Returns:
+            The bridge response.
+        """
+        return self._post("/note", {
+            "parentItemKey": parent_item_key,
+            "note": note,
+        })
@@ -0,0 +1,67 @@
+"""
+Configuration storage for the Zotero write bridge.
+
+The bridge token lives under the "write_bridge" key of the shared
+zotero-mcp config file (~/.config/zotero-mcp/config.json).
+"""
+
+import functools
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = Path.home() / ".config" / "zotero-mcp" / "config.json"
+
+
+def _load_config(path: Path) -> Dict[str, Any]:
+    """Load the config file, returning an empty dict if missing/invalid."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Error loading config from {path}: {e}")
+        return {}
+
+
+def _save_config(config: Dict[str, Any], path: Path) -> None:
+    """Write the config file, creating parent directories as needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(config, indent=2))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Cached config load keyed on the file's mtime.
+
+    Including st_mtime_ns in the key means writes through _save_config
+    invalidate the cache transparently: the next read sees a new mtime
+    and re-parses, with no manual cache clearing.
+    """
+    return _load_config(Path(path_str))
+
+
+def _mtime_ns(path: Path) -> int:
+    """The file's st_mtime_ns, or 0 if it doesn't exist."""
+    return path.stat().st_mtime_ns if path.exists() else 0
+
+
+def load_config(path: Path = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """Cached read of the config file, invalidated when its mtime changes."""
+    return _load_config_cached(str(path), _mtime_ns(path))
+
+
+def get_bridge_token(path: Path = DEFAULT_CONFIG_PATH) -> Optional[str]:
+    """Get the stored write bridge auth token, if any."""
+    return load_config(path).get("write_bridge", {}).get("token")
+
+
+def set_bridge_token(token: str, path: Path = DEFAULT_CONFIG_PATH) -> None:
+    """Store the write bridge auth token."""
+    config = _load_config(path)
+    config.setdefault("write_bridge", {})["token"] = token
+    _save_config(config, path)